@@ -7,11 +7,65 @@ Analyzes VM Hub event logs and generates comprehensive statistics and summaries.
 
 import json
 import sys
-from collections import defaultdict, Counter
-from datetime import datetime
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _write_json_indented(obj, f) -> None:
+        """Write obj as indented JSON, plus a trailing newline, to binary file f."""
+        # OPT_NON_STR_KEYS keeps parity with json.dump for keys such as a
+        # None priority from a log line with "priority": null
+        options = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        f.write(orjson.dumps(obj, option=options))
+else:
+    _json_loads = json.loads
+
+    def _write_json_indented(obj, f) -> None:
+        """Write obj as indented JSON, plus a trailing newline, to binary file f."""
+        # Stream the encoder's chunks rather than building the whole document
+        for chunk in json.JSONEncoder(indent=2).iterencode(obj):
+            f.write(chunk.encode('utf-8'))
+        f.write(b'\n')
+
+
+def _to_datetime64(times: List[str]) -> np.ndarray:
+    """Convert ISO 8601 UTC timestamps (as logged by the hub) to datetime64."""
+    # numpy has no timezone support, so drop the UTC designator first
+    return np.array([t[:-1] if t.endswith('Z') else t for t in times],
+                    dtype='datetime64[us]')
+
+
+def _format_datetime64(value: np.datetime64) -> str:
+    """Format a datetime64 for display, to the second."""
+    return np.datetime_as_string(value, unit='s').replace('T', ' ')
+
+
+def _group_runs(ts: np.ndarray, max_gap: int, min_len: int) -> np.ndarray:
+    """
+    Group sorted integer timestamps into runs separated by gaps > max_gap.
+    
+    Returns an (M, 3) array of (start_index, end_index, count) rows for the
+    runs with at least min_len members.
+    """
+    # A new run starts wherever the gap to the previous timestamp is too large
+    boundaries = np.flatnonzero(np.diff(ts) > max_gap) + 1
+    starts = np.concatenate((np.zeros(1, dtype=np.int64), boundaries))
+    ends = np.concatenate((boundaries, np.full(1, len(ts), dtype=np.int64))) - 1
+    counts = ends - starts + 1
+    keep = counts >= min_len
+    return np.column_stack((starts[keep], ends[keep], counts[keep]))
+
 
 class VMHubLogAnalyzer:
     """Analyzer for Virgin Media Hub event logs."""
@@ -26,6 +80,8 @@ class VMHubLogAnalyzer:
     
     PRIORITY_LEVELS = ["critical", "error", "warning", "notice"]
     
+    PRIORITY_ICONS = {"critical": "🔴", "error": "🟠", "warning": "🟡", "notice": "🔵"}
+    
     def __init__(self, log_file: str):
         """Initialize analyzer with log file path."""
         self.log_file = Path(log_file)
@@ -36,19 +92,19 @@ class VMHubLogAnalyzer:
         """Load and parse JSON log entries."""
         self.events = []
         
-        with open(self.log_file, 'r') as f:
+        with open(self.log_file, 'rb') as f:
             for line_num, line in enumerate(f, 1):
                 line = line.strip()
                 if not line:
                     continue
                     
                 try:
-                    event = json.loads(line)
-                    # Parse timestamp
-                    if 'time' in event:
-                        event['datetime'] = datetime.fromisoformat(
-                            event['time'].replace('Z', '+00:00')
-                        )
+                    event = _json_loads(line)
+                    # Only a handful of priority values exist, so share one
+                    # string object per value across all loaded events
+                    priority = event.get('priority')
+                    if isinstance(priority, str):
+                        event['priority'] = sys.intern(priority)
                     self.events.append(event)
                 except json.JSONDecodeError as e:
                     print(f"Warning: Skipping malformed JSON at line {line_num}: {e}", 
@@ -62,33 +118,49 @@ class VMHubLogAnalyzer:
             print("No events to analyze. Load logs first.")
             return
             
+        priority_counts, buckets = self._bucket_by_priority()
+        
         self.stats = {
             'total_events': len(self.events),
-            'priority_counts': self._count_by_priority(),
+            'priority_counts': dict(priority_counts),
             'date_range': self._get_date_range(),
             'device_info': self._extract_device_info(),
-            'critical_issues': self._analyze_critical_issues(),
-            'error_issues': self._analyze_error_issues(),
-            'warning_issues': self._analyze_warning_issues(),
-            'message_types': self._analyze_message_types(),
-            'outage_periods': self._identify_outage_periods(),
-            'channel_failures': self._analyze_channel_failures(),
+            'critical_issues': self._analyze_critical_issues(buckets['critical']),
+            'error_issues': self._analyze_error_issues(buckets['error']),
+            'warning_issues': self._analyze_warning_issues(buckets['warning']),
+            'message_types': self._analyze_message_types(buckets['notice']),
+            'outage_periods': self._identify_outage_periods(buckets['critical']),
+            'channel_failures': self._analyze_channel_failures(buckets['critical']),
         }
         
-    def _count_by_priority(self) -> Dict[str, int]:
-        """Count events by priority level."""
-        counts = Counter(event.get('priority', 'unknown') for event in self.events)
-        return dict(counts)
+    def _bucket_by_priority(self) -> Tuple[Counter, Dict[str, List[Dict]]]:
+        """
+        Count events by priority and group them into per-priority lists.
+        
+        Walks the events once so the per-priority analyses below don't each
+        have to rescan and filter the full event list.
+        """
+        counts = Counter()
+        buckets: Dict[str, List[Dict]] = {priority: [] for priority in self.PRIORITY_LEVELS}
+        
+        for event in self.events:
+            priority = event.get('priority', 'unknown')
+            counts[priority] += 1
+            bucket = buckets.get(priority)
+            if bucket is not None:
+                bucket.append(event)
+                
+        return counts, buckets
         
     def _get_date_range(self) -> Tuple[str, str]:
         """Get the date range of logged events."""
-        dates = [e['datetime'] for e in self.events if 'datetime' in e]
-        if not dates:
+        # ISO 8601 UTC timestamps sort correctly as plain strings, so only
+        # the two endpoints need converting for display
+        times = [e['time'] for e in self.events if 'time' in e]
+        if not times:
             return ("N/A", "N/A")
-        return (
-            min(dates).strftime("%Y-%m-%d %H:%M:%S"),
-            max(dates).strftime("%Y-%m-%d %H:%M:%S")
-        )
+        first, last = _to_datetime64([min(times), max(times)])
+        return (_format_datetime64(first), _format_datetime64(last))
     
     def _extract_device_info(self) -> Dict:
         """Extract CM-MAC and CMTS-MAC addresses from log messages."""
@@ -100,29 +172,23 @@ class VMHubLogAnalyzer:
             
             # Extract CM-MAC
             if 'CM-MAC=' in msg:
-                try:
-                    cm_mac = msg.split('CM-MAC=')[1].split(';')[0].strip()
+                cm_mac = msg.partition('CM-MAC=')[2].partition(';')[0].strip()
+                if cm_mac:
                     cm_macs.add(cm_mac)
-                except:
-                    pass
             
             # Extract CMTS-MAC
             if 'CMTS-MAC=' in msg:
-                try:
-                    cmts_mac = msg.split('CMTS-MAC=')[1].split(';')[0].strip()
+                cmts_mac = msg.partition('CMTS-MAC=')[2].partition(';')[0].strip()
+                if cmts_mac:
                     cmts_macs.add(cmts_mac)
-                except:
-                    pass
         
         return {
             'cm_mac_addresses': sorted(list(cm_macs)),
             'cmts_mac_addresses': sorted(list(cmts_macs))
         }
         
-    def _analyze_critical_issues(self) -> Dict:
+    def _analyze_critical_issues(self, critical_events: List[Dict]) -> Dict:
         """Analyze critical priority events."""
-        critical_events = [e for e in self.events if e.get('priority') == 'critical']
-        
         # Categorize critical events
         t3_timeouts = []
         retries_exhausted = []
@@ -145,11 +211,9 @@ class VMHubLogAnalyzer:
         for event in consecutive_timeouts:
             msg = event.get('message', '')
             if 'upstream channel' in msg:
-                try:
-                    channel = msg.split('upstream channel')[1].split(';')[0].strip()
+                channel = msg.partition('upstream channel')[2].partition(';')[0].strip()
+                if channel:
                     affected_channels.append(channel)
-                except:
-                    pass
                     
         return {
             'total_count': len(critical_events),
@@ -157,15 +221,13 @@ class VMHubLogAnalyzer:
             'retries_exhausted': len(retries_exhausted),
             'consecutive_timeouts': len(consecutive_timeouts),
             'no_response_events': len(no_response),
-            'affected_upstream_channels': list(set(affected_channels)),
+            'affected_upstream_channels': sorted(set(affected_channels), key=self._channel_sort_key),
         }
         
-    def _analyze_error_issues(self) -> Dict:
+    def _analyze_error_issues(self, error_events: List[Dict]) -> Dict:
         """Analyze error priority events."""
-        error_events = [e for e in self.events if e.get('priority') == 'error']
-        
         # Categorize error messages
-        message_types = Counter(event.get('message', '').split(';')[0] 
+        message_types = Counter(event.get('message', '').partition(';')[0]
                                for event in error_events)
         
         return {
@@ -173,93 +235,91 @@ class VMHubLogAnalyzer:
             'message_types': dict(message_types),
         }
         
-    def _analyze_warning_issues(self) -> Dict:
+    def _analyze_warning_issues(self, warning_events: List[Dict]) -> Dict:
         """Analyze warning priority events."""
-        warning_events = [e for e in self.events if e.get('priority') == 'warning']
-        
         # Categorize warnings
-        mdd_timeouts = [e for e in warning_events if 'MDD message timeout' in e.get('message', '')]
-        dbc_mismatches = [e for e in warning_events if 'DBC-REQ Mismatch' in e.get('message', '')]
+        mdd_timeouts = 0
+        dbc_mismatches = 0
+        
+        for event in warning_events:
+            msg = event.get('message', '')
+            if 'MDD message timeout' in msg:
+                mdd_timeouts += 1
+            if 'DBC-REQ Mismatch' in msg:
+                dbc_mismatches += 1
         
         return {
             'total_count': len(warning_events),
-            'mdd_timeout_count': len(mdd_timeouts),
-            'dbc_mismatch_count': len(dbc_mismatches),
+            'mdd_timeout_count': mdd_timeouts,
+            'dbc_mismatch_count': dbc_mismatches,
         }
         
-    def _analyze_message_types(self) -> Dict:
+    def _analyze_message_types(self, notice_events: List[Dict]) -> Dict:
         """Analyze different types of status messages."""
-        notice_events = [e for e in self.events if e.get('priority') == 'notice']
+        cm_status = 0
+        profile_changes = 0
+        login_events = 0
         
-        cm_status = [e for e in notice_events if 'CM-STATUS' in e.get('message', '')]
-        profile_changes = [e for e in notice_events if 'US profile assignment change' in e.get('message', '')]
-        login_events = [e for e in notice_events if 'Login' in e.get('message', '')]
+        for event in notice_events:
+            msg = event.get('message', '')
+            if 'CM-STATUS' in msg:
+                cm_status += 1
+            if 'US profile assignment change' in msg:
+                profile_changes += 1
+            if 'Login' in msg:
+                login_events += 1
         
         return {
-            'cm_status_messages': len(cm_status),
-            'profile_changes': len(profile_changes),
-            'login_events': len(login_events),
+            'cm_status_messages': cm_status,
+            'profile_changes': profile_changes,
+            'login_events': login_events,
         }
         
-    def _identify_outage_periods(self) -> List[Dict]:
+    def _identify_outage_periods(self, critical_events: List[Dict]) -> List[Dict]:
         """Identify periods with multiple critical errors (potential outages)."""
-        critical_events = [e for e in self.events 
-                          if e.get('priority') == 'critical' and 'datetime' in e]
+        times = [e['time'] for e in critical_events if 'time' in e]
         
-        if not critical_events:
+        if not times:
             return []
             
         # Sort by time
-        critical_events.sort(key=lambda x: x['datetime'])
+        ts = np.sort(_to_datetime64(times))
+        
+        # Group events within 5 minutes of each other, at least 3 critical
+        # events = outage. Timestamps are compared as integer microseconds.
+        max_gap = int(np.timedelta64(300, 's') // np.timedelta64(1, 'us'))
+        runs = _group_runs(ts.view(np.int64), max_gap, 3)
         
-        # Group events within 5 minutes of each other
         outages = []
-        current_outage = [critical_events[0]]
-        
-        for event in critical_events[1:]:
-            time_diff = (event['datetime'] - current_outage[-1]['datetime']).total_seconds()
-            if time_diff <= 300:  # 5 minutes
-                current_outage.append(event)
-            else:
-                if len(current_outage) >= 3:  # At least 3 critical events = outage
-                    outages.append({
-                        'start': current_outage[0]['datetime'].strftime("%Y-%m-%d %H:%M:%S"),
-                        'end': current_outage[-1]['datetime'].strftime("%Y-%m-%d %H:%M:%S"),
-                        'event_count': len(current_outage),
-                        'duration_seconds': (current_outage[-1]['datetime'] - 
-                                           current_outage[0]['datetime']).total_seconds()
-                    })
-                current_outage = [event]
-                
-        # Check last group
-        if len(current_outage) >= 3:
+        for start, end, count in runs:
             outages.append({
-                'start': current_outage[0]['datetime'].strftime("%Y-%m-%d %H:%M:%S"),
-                'end': current_outage[-1]['datetime'].strftime("%Y-%m-%d %H:%M:%S"),
-                'event_count': len(current_outage),
-                'duration_seconds': (current_outage[-1]['datetime'] - 
-                                   current_outage[0]['datetime']).total_seconds()
+                'start': _format_datetime64(ts[start]),
+                'end': _format_datetime64(ts[end]),
+                'event_count': int(count),
+                'duration_seconds': float((ts[end] - ts[start]) / np.timedelta64(1, 's')),
             })
             
         return outages
         
-    def _analyze_channel_failures(self) -> Dict:
+    def _analyze_channel_failures(self, critical_events: List[Dict]) -> Dict:
         """Analyze which upstream channels experienced failures."""
-        critical_events = [e for e in self.events if e.get('priority') == 'critical']
-        
-        channel_failures = defaultdict(int)
+        channel_failures = Counter()
         
         for event in critical_events:
             msg = event.get('message', '')
             if 'upstream channel' in msg:
-                try:
-                    # Extract channel number
-                    channel = msg.split('upstream channel')[1].split(';')[0].strip()
+                # Extract channel number
+                channel = msg.partition('upstream channel')[2].partition(';')[0].strip()
+                if channel:
                     channel_failures[channel] += 1
-                except:
-                    pass
                     
-        return dict(sorted(channel_failures.items(), key=lambda x: int(x[0]) if x[0].isdigit() else 999))
+        return {channel: channel_failures[channel]
+                for channel in sorted(channel_failures, key=self._channel_sort_key)}
+        
+    @staticmethod
+    def _channel_sort_key(channel: str) -> int:
+        """Sort key ordering channels numerically, non-numeric ones last."""
+        return int(channel) if channel.isdigit() else 999
         
     def print_summary(self) -> None:
         """Print a formatted summary of the analysis."""
@@ -267,106 +327,110 @@ class VMHubLogAnalyzer:
             print("No statistics available. Run analyze() first.")
             return
             
-        print("\n" + "="*70)
-        print("VIRGIN MEDIA HUB LOG ANALYSIS SUMMARY")
-        print("="*70)
+        # Collect the report and write it in one go instead of line by line
+        lines: List[str] = []
+        
+        lines.append("\n" + "="*70)
+        lines.append("VIRGIN MEDIA HUB LOG ANALYSIS SUMMARY")
+        lines.append("="*70)
         
         # Overview
-        print(f"\n📊 OVERVIEW")
-        print(f"  Total Events: {self.stats['total_events']:,}")
-        print(f"  Date Range: {self.stats['date_range'][0]} to {self.stats['date_range'][1]}")
+        lines.append(f"\n📊 OVERVIEW")
+        lines.append(f"  Total Events: {self.stats['total_events']:,}")
+        lines.append(f"  Date Range: {self.stats['date_range'][0]} to {self.stats['date_range'][1]}")
         
         # Device Info
         device_info = self.stats.get('device_info', {})
         if device_info:
-            print(f"\n🔧 DEVICE INFORMATION")
+            lines.append(f"\n🔧 DEVICE INFORMATION")
             cm_macs = device_info.get('cm_mac_addresses', [])
             cmts_macs = device_info.get('cmts_mac_addresses', [])
             
             if cm_macs:
-                print(f"  CM-MAC Address(es): {', '.join(cm_macs)}")
+                lines.append(f"  CM-MAC Address(es): {', '.join(cm_macs)}")
             if cmts_macs:
-                print(f"  CMTS-MAC Address(es): {', '.join(cmts_macs)}")
+                lines.append(f"  CMTS-MAC Address(es): {', '.join(cmts_macs)}")
         
         # Priority breakdown
-        print(f"\n📈 EVENT PRIORITY BREAKDOWN")
+        lines.append(f"\n📈 EVENT PRIORITY BREAKDOWN")
         priority_counts = self.stats['priority_counts']
         total = self.stats['total_events']
-        for priority in ['critical', 'error', 'warning', 'notice']:
+        for priority in self.PRIORITY_LEVELS:
             count = priority_counts.get(priority, 0)
             percentage = (count / total * 100) if total > 0 else 0
-            icon = {'critical': '🔴', 'error': '🟠', 'warning': '🟡', 'notice': '🔵'}.get(priority, '⚪')
-            print(f"  {icon} {priority.capitalize():10} {count:6,} ({percentage:5.1f}%)")
+            icon = self.PRIORITY_ICONS.get(priority, '⚪')
+            lines.append(f"  {icon} {priority.capitalize():10} {count:6,} ({percentage:5.1f}%)")
             
         # Critical Issues
         crit = self.stats['critical_issues']
-        print(f"\n🚨 CRITICAL ISSUES (T3 TIMEOUTS)")
-        print(f"  Total Critical Events: {crit['total_count']}")
-        print(f"  T3 Timeout Starts: {crit['t3_timeout_starts']}")
-        print(f"  Retries Exhausted: {crit['retries_exhausted']}")
-        print(f"  16 Consecutive Timeouts: {crit['consecutive_timeouts']}")
-        print(f"  No Response Events: {crit['no_response_events']}")
+        lines.append(f"\n🚨 CRITICAL ISSUES (T3 TIMEOUTS)")
+        lines.append(f"  Total Critical Events: {crit['total_count']}")
+        lines.append(f"  T3 Timeout Starts: {crit['t3_timeout_starts']}")
+        lines.append(f"  Retries Exhausted: {crit['retries_exhausted']}")
+        lines.append(f"  16 Consecutive Timeouts: {crit['consecutive_timeouts']}")
+        lines.append(f"  No Response Events: {crit['no_response_events']}")
         
         if crit['affected_upstream_channels']:
-            channels = ', '.join(sorted(crit['affected_upstream_channels'], 
-                                       key=lambda x: int(x) if x.isdigit() else 999))
-            print(f"  Affected Upstream Channels: {channels}")
+            channels = ', '.join(crit['affected_upstream_channels'])
+            lines.append(f"  Affected Upstream Channels: {channels}")
             
         # Channel Failures
         channel_failures = self.stats['channel_failures']
         if channel_failures:
-            print(f"\n📡 UPSTREAM CHANNEL FAILURES")
+            lines.append(f"\n📡 UPSTREAM CHANNEL FAILURES")
             for channel, count in channel_failures.items():
-                print(f"  Channel {channel:2}: {count:3} failures")
+                lines.append(f"  Channel {channel:2}: {count:3} failures")
                 
         # Error Issues
         err = self.stats['error_issues']
         if err['total_count'] > 0:
-            print(f"\n⚠️  ERROR LEVEL ISSUES")
-            print(f"  Total Error Events: {err['total_count']}")
+            lines.append(f"\n⚠️  ERROR LEVEL ISSUES")
+            lines.append(f"  Total Error Events: {err['total_count']}")
             if err['message_types']:
-                print(f"  Error Types:")
+                lines.append(f"  Error Types:")
                 for msg_type, count in err['message_types'].items():
-                    print(f"    - {msg_type}: {count}")
+                    lines.append(f"    - {msg_type}: {count}")
                     
         # Warning Issues
         warn = self.stats['warning_issues']
-        print(f"\n🟡 WARNING LEVEL ISSUES")
-        print(f"  Total Warnings: {warn['total_count']}")
-        print(f"  MDD Timeouts: {warn['mdd_timeout_count']}")
-        print(f"  DBC Mismatches: {warn['dbc_mismatch_count']}")
+        lines.append(f"\n🟡 WARNING LEVEL ISSUES")
+        lines.append(f"  Total Warnings: {warn['total_count']}")
+        lines.append(f"  MDD Timeouts: {warn['mdd_timeout_count']}")
+        lines.append(f"  DBC Mismatches: {warn['dbc_mismatch_count']}")
         
         # Outage Periods
         outages = self.stats['outage_periods']
         if outages:
-            print(f"\n⏱️  IDENTIFIED OUTAGE PERIODS ({len(outages)} total)")
+            lines.append(f"\n⏱️  IDENTIFIED OUTAGE PERIODS ({len(outages)} total)")
             for i, outage in enumerate(outages, 1): 
                 duration_min = outage['duration_seconds'] / 60
-                print(f"  {i}. {outage['start']} to {outage['end']}")
-                print(f"     Duration: {duration_min:.1f} min | Events: {outage['event_count']}")
+                lines.append(f"  {i}. {outage['start']} to {outage['end']}")
+                lines.append(f"     Duration: {duration_min:.1f} min | Events: {outage['event_count']}")
                 
         # Status Messages
         msg_types = self.stats['message_types']
-        print(f"\n📋 INFORMATIONAL EVENTS")
-        print(f"  CM-STATUS Messages: {msg_types['cm_status_messages']}")
-        print(f"  Profile Changes: {msg_types['profile_changes']}")
-        print(f"  Login Events: {msg_types['login_events']}")
+        lines.append(f"\n📋 INFORMATIONAL EVENTS")
+        lines.append(f"  CM-STATUS Messages: {msg_types['cm_status_messages']}")
+        lines.append(f"  Profile Changes: {msg_types['profile_changes']}")
+        lines.append(f"  Login Events: {msg_types['login_events']}")
         
         # Recommendations
-        print(f"\n💡 RECOMMENDATIONS")
+        lines.append(f"\n💡 RECOMMENDATIONS")
         if crit['total_count'] > 10:
-            print(f"  ⚠️  URGENT: Severe upstream signal problems detected!")
-            print(f"     - Contact Virgin Media technical support immediately")
-            print(f"     - Check all cable connections for damage or looseness")
-            print(f"     - Request upstream signal level testing")
+            lines.append(f"  ⚠️  URGENT: Severe upstream signal problems detected!")
+            lines.append(f"     - Contact Virgin Media technical support immediately")
+            lines.append(f"     - Check all cable connections for damage or looseness")
+            lines.append(f"     - Request upstream signal level testing")
             
         if warn['mdd_timeout_count'] > 20:
-            print(f"  ⚠️  Frequent MDD timeouts indicate network communication issues")
+            lines.append(f"  ⚠️  Frequent MDD timeouts indicate network communication issues")
             
         if warn['dbc_mismatch_count'] > 10:
-            print(f"  ⚠️  DBC mismatches suggest signal quality problems")
+            lines.append(f"  ⚠️  DBC mismatches suggest signal quality problems")
             
-        print("\n" + "="*70)
+        lines.append("\n" + "="*70)
+        
+        sys.stdout.write("\n".join(lines) + "\n")
         
     def export_json(self, output_file: str = None) -> None:
         """Export statistics to JSON file."""
@@ -384,8 +448,8 @@ class VMHubLogAnalyzer:
             'end': self.stats['date_range'][1]
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(export_stats, f, indent=2)
+        with open(output_file, 'wb') as f:
+            _write_json_indented(export_stats, f)
             
         print(f"\n✅ Statistics exported to: {output_file}")
 
@@ -7,20 +7,40 @@ highlighting critical events in red.
 """
 
 import argparse
+import asyncio
 import json
+import mmap
+import sqlite3
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
 
 # Suppress SSL warnings when using verify=False
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
 class VMHubLogger:
     """Logger for Virgin Media Hub 5 event logs."""
     
@@ -41,41 +61,83 @@ class VMHubLogger:
         self.hub_ip = hub_ip
         self.log_file = Path(log_file)
         self.interval = interval
-        self.seen_events: Set[str] = set()
+        
+        # Reuse one HTTPS connection to the hub across polls
+        self._session = requests.Session()
+        self._session.verify = False  # Skip SSL verification (equivalent to curl -k)
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
         
         # Create log file if it doesn't exist
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
         self.log_file.touch(exist_ok=True)
         
+        # Keys of all logged events are kept in a SQLite sidecar next to the
+        # log, so startup doesn't have to re-parse the whole log file
+        self.seen_db_file = self.log_file.with_name(self.log_file.name + '.seen.db')
+        self._db = sqlite3.connect(str(self.seen_db_file))
+        # One non-NULL text key per event: SQLite treats NULLs as distinct in
+        # a uniqueness check, so per-field columns would let events with null
+        # fields be logged again on every poll. Sidecars using that older
+        # per-field "seen" table are dropped and rebuilt from the log.
+        with self._db:
+            self._db.execute("DROP TABLE IF EXISTS seen")
+            self._db.execute("CREATE TABLE IF NOT EXISTS seen_keys (k TEXT PRIMARY KEY)")
+        
         # Load existing events to avoid duplicates
         self._load_existing_events()
     
+    def _count_seen_events(self) -> int:
+        """Return the number of events recorded in the seen-events sidecar."""
+        return self._db.execute("SELECT COUNT(*) FROM seen_keys").fetchone()[0]
+    
     def _load_existing_events(self):
-        """Load existing events from the log file to avoid duplicates."""
-        if self.log_file.exists() and self.log_file.stat().st_size > 0:
-            try:
-                with open(self.log_file, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            try:
-                                event = json.loads(line.strip())
-                                event_hash = self._hash_event(event)
-                                self.seen_events.add(event_hash)
-                            except json.JSONDecodeError:
-                                continue
-                print(f"Loaded {len(self.seen_events)} existing events from log file")
-            except Exception as e:
-                print(f"Warning: Could not load existing events: {e}")
+        """
+        Make sure the seen-events sidecar covers the existing log file.
+        
+        The log file is only parsed when the sidecar is empty, e.g. on the
+        first run against a log written by an older version. If the log file
+        itself is empty the sidecar is cleared so events are logged again.
+        """
+        try:
+            if self.log_file.stat().st_size == 0:
+                with self._db:
+                    self._db.execute("DELETE FROM seen_keys")
+                return
+            
+            count = self._count_seen_events()
+            if count > 0:
+                print(f"Loaded {count} existing events from {self.seen_db_file}")
+                return
+            
+            # Map the file rather than reading it so large logs are
+            # parsed straight from the page cache without extra copies
+            keys = []
+            with open(self.log_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b''):
+                    if line.strip():
+                        try:
+                            event = _json_loads(line)
+                            keys.append((self._hash_event(event),))
+                        except json.JSONDecodeError:
+                            continue
+            
+            with self._db:
+                self._db.executemany("INSERT OR IGNORE INTO seen_keys VALUES (?)", keys)
+            print(f"Loaded {self._count_seen_events()} existing events from log file")
+        except Exception as e:
+            print(f"Warning: Could not load existing events: {e}")
     
     def _hash_event(self, event: Dict) -> str:
         """
-        Create a unique hash for an event.
+        Create a unique key for an event.
         
         Args:
             event: Event dictionary
             
         Returns:
-            Hash string representing the event
+            Non-NULL "time|priority|message" string identifying the event,
+            used as the key in the seen-events sidecar
         """
         # Use time, priority, and message to create a unique identifier
         return f"{event.get('time', '')}|{event.get('priority', '')}|{event.get('message', '')}"
@@ -89,16 +151,12 @@ class VMHubLogger:
         """
         try:
             url = f"https://{self.hub_ip}/rest/v1/cablemodem/eventlog"
-            response = requests.get(
-                url,
-                verify=False,  # Skip SSL verification (equivalent to curl -k)
-                timeout=10
-            )
+            response = self._session.get(url, timeout=10)
             
             response.raise_for_status()
             
             # Parse JSON response
-            data = response.json()
+            data = _json_loads(response.content)
             events = data.get('eventlog', [])
             return events if isinstance(events, list) else []
                 
@@ -142,17 +200,6 @@ class VMHubLogger:
             f"{'-' * 80}"
         )
     
-    def _save_event(self, event: Dict):
-        """
-        Save an event to the log file.
-        
-        Args:
-            event: Event dictionary
-        """
-        with open(self.log_file, 'a') as f:
-            json.dump(event, f)
-            f.write('\n')
-    
     def process_events(self, events: List[Dict]):
         """
         Process fetched events, saving new ones and highlighting critical ones.
@@ -160,33 +207,66 @@ class VMHubLogger:
         Args:
             events: List of event dictionaries
         """
-        new_events = 0
+        new_lines: List[bytes] = []
         new_critical = 0
         
-        # Sort events by time (oldest first) to maintain chronological order
-        sorted_events = sorted(events, key=lambda e: e.get('time', ''))
-        
-        for event in sorted_events:
-            event_hash = self._hash_event(event)
+        # The sidecar inserts are only committed once the batch has been
+        # written to the log file, and rolled back if that write fails
+        with self._db:
+            # Check events in the order the hub returned them. Only the
+            # sidecar key decides what is new, so events with a missing time
+            # or from before the hub's clock synced after a reboot are kept.
+            unseen_events = []
+            for event in events:
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO seen_keys VALUES (?)", (self._hash_event(event),)
+                )
+                
+                # Skip if we've already seen this event
+                if cursor.rowcount == 0:
+                    continue
+                
+                unseen_events.append(event)
             
-            # Skip if we've already seen this event
-            if event_hash in self.seen_events:
-                continue
+            # Sort only the new events by time (oldest first) to maintain
+            # chronological order in the log file
+            unseen_events.sort(key=lambda e: str(e.get('time', '')))
             
-            # New event - save it
-            self.seen_events.add(event_hash)
-            self._save_event(event)
-            new_events += 1
+            for event in unseen_events:
+                new_lines.append(_json_dumps(event) + b'\n')
+                
+                # If critical, display it
+                if event.get('priority') == 'critical':
+                    print(self._format_critical_event(event))
+                    new_critical += 1
             
-            # If critical, display it
-            if event.get('priority') == 'critical':
-                print(self._format_critical_event(event))
-                new_critical += 1
+            if new_lines:
+                # Append the whole batch with a single write
+                with open(self.log_file, 'ab') as f:
+                    f.writelines(new_lines)
         
+        new_events = len(new_lines)
         if new_events > 0:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             print(f"[{timestamp}] Processed {new_events} new event(s) ({new_critical} critical)")
     
+    async def run_async(self):
+        """
+        Poll the hub forever without blocking the event loop.
+        
+        The HTTP request runs in the default executor while the loop waits,
+        and polls are scheduled every interval seconds from the start of the
+        previous poll, so fetch time doesn't stretch the interval. Several
+        loggers (e.g. one per hub) can be run together with asyncio.gather().
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            next_poll = loop.time() + self.interval
+            events = await loop.run_in_executor(None, self._fetch_logs)
+            if events:
+                self.process_events(events)
+            await asyncio.sleep(max(0.0, next_poll - loop.time()))
+    
     def run(self):
         """Run the logger continuously."""
         print(f"Starting VM Hub Logger")
@@ -196,16 +276,14 @@ class VMHubLogger:
         print(f"Press Ctrl+C to stop\n")
         
         try:
-            while True:
-                events = self._fetch_logs()
-                if events:
-                    self.process_events(events)
-                time.sleep(self.interval)
+            asyncio.run(self.run_async())
                 
         except KeyboardInterrupt:
             print("\n\nStopping logger...")
-            print(f"Total events logged: {len(self.seen_events)}")
+            print(f"Total events logged: {self._count_seen_events()}")
             print(f"Log file: {self.log_file}")
+            self._session.close()
+            self._db.close()
 
 
 def main():